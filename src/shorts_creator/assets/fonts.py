@@ -13,6 +13,17 @@ ROBOTO_REGULAR = FONTS_DIR / "Roboto-Regular.ttf"
 ROBOTO_BOLD = FONTS_DIR / "Roboto-Bold.ttf"
 COMIC_NEUE_BOLD = FONTS_DIR / "ComicNeue-Bold.ttf"
 
+_FONT_MAP: dict[str, Path] = {
+    "roboto-bold": ROBOTO_BOLD,
+    "roboto-regular": ROBOTO_REGULAR,
+    "comic-neue-bold": COMIC_NEUE_BOLD,
+}
+
+# Bundled fonts never change at runtime, so check them once at import
+_AVAILABLE_FONTS: dict[str, Path] = {
+    name: path for name, path in _FONT_MAP.items() if path.is_file()
+}
+
 
 def get_font_path(font_name: str = "roboto-bold") -> Path:
     """
@@ -27,18 +38,15 @@ def get_font_path(font_name: str = "roboto-bold") -> Path:
     Raises:
         FileNotFoundError: If the font file doesn't exist
     """
-    font_map = {
-        "roboto-bold": ROBOTO_BOLD,
-        "roboto-regular": ROBOTO_REGULAR,
-        "comic-neue-bold": COMIC_NEUE_BOLD,
-    }
-    
-    font_path = font_map.get(font_name.lower())
-    if not font_path:
-        raise ValueError(f"Unknown font: {font_name}. Available: {list(font_map.keys())}")
-    
-    if not font_path.exists():
-        raise FileNotFoundError(f"Font file not found: {font_path}")
-    
+    key = font_name.lower()
+    try:
+        font_path = _AVAILABLE_FONTS[key]
+    except KeyError:
+        if key in _FONT_MAP:
+            raise FileNotFoundError(f"Font file not found: {_FONT_MAP[key]}") from None
+        raise ValueError(
+            f"Unknown font: {font_name}. Available: {list(_FONT_MAP.keys())}"
+        ) from None
+
     log.debug(f"Using font: {font_path}")
     return font_path
\ No newline at end of file
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SpeechSegment(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     start_time: float = Field(
         description="Start time in seconds from the beginning of the audio"
     )
@@ -12,6 +14,8 @@ class SpeechSegment(BaseModel):
 
 
 class Speech(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     language: str = Field(description="Language code of the transcript")
     duration_seconds: float = Field(
         description="Total duration of the audio in seconds"
@@ -22,6 +26,8 @@ class Speech(BaseModel):
 
 
 class YouTubeShort(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     title: str = Field(description="Catchy title for the short (max 30 characters)")
     subscribe_subtitle: str = Field(
         description="Subtitle encouraging viewers to subscribe (max 50 characters)",
@@ -59,6 +65,8 @@ class YouTubeShortWithSpeech(YouTubeShort):
     )
 
 class YouTubeShortsRecommendation(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     shorts: list[YouTubeShortWithSpeech] = Field(
         description="List of identified YouTube shorts segments"
     )
@@ -1,6 +1,10 @@
+import hashlib
+import itertools
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from tqdm import tqdm
 from shorts_creator.pipeline import (
@@ -10,74 +14,153 @@ from shorts_creator.pipeline import (
     storage,
     video_cutter,
 )
-from shorts_creator.domain.models import YouTubeShortsRecommendation
+from shorts_creator.domain.models import (
+    YouTubeShortsRecommendation,
+    YouTubeShortWithSpeech,
+)
 from shorts_creator.video_effect import video_effect_service
 from shorts_creator.video_effect.strategies import VideoEffectsStrategy
 from shorts_creator.settings.settings import parse_args, AppSettings
-from shorts_creator.youtube.youtube import YouTubeService
+
+if TYPE_CHECKING:
+    from shorts_creator.youtube.youtube import YouTubeService
 
 
 log = logging.getLogger(__name__)
 
 
+def _effects_cache_key(
+    short: YouTubeShortWithSpeech, settings: AppSettings
+) -> dict[str, object]:
+    """Everything that shapes a finished short; a change to any of it redoes it."""
+    return {
+        "source": str(settings.video_path),
+        "short": hashlib.sha256(short.model_dump_json().encode("utf-8")).hexdigest(),
+        "strategy": settings.video_effect_strategy.name,
+        "speed_factor": settings.speed_factor,
+        "fill_mode": settings.video_fill_mode,
+        "video_encoder": settings.video_encoder,
+        "video_preset": settings.video_preset,
+        "video_crf": settings.video_crf,
+        "hwaccel": settings.hwaccel,
+    }
+
+
+def _process_one_short(
+    short_index: int,
+    short: YouTubeShortWithSpeech,
+    cut_path: Path,
+    final_path: Path,
+    settings: AppSettings,
+    videos_output_dir: Path,
+    threads: int,
+) -> Path:
+    """Apply effects to one already cut short. Runs in a worker process."""
+    effects_path = video_effect_service.apply_effects(
+        short,
+        settings,
+        cut_path,
+        settings.video_effect_strategy,
+        videos_output_dir,
+        short_index=short_index,
+        threads=threads,
+        clip_start=video_cutter.read_cut_start(cut_path, short.start_time),
+    )
+    os.replace(effects_path, final_path)
+    video_cutter.save_cache_key(final_path, _effects_cache_key(short, settings))
+    if not settings.debug:
+        video_cutter.remove_cached(cut_path)
+    return final_path
+
+
 def process_shorts_with_progress(
     recommendation: YouTubeShortsRecommendation,
     settings: AppSettings,
     videos_output_dir: Path,
-    youtube_service: Optional[YouTubeService] = None,
+    youtube_service: Optional["YouTubeService"] = None,
 ):
-    with tqdm(
-        total=len(recommendation.shorts),
+    # Each short is an independent chain of ffmpeg jobs, so they are cut and
+    # encoded in parallel. Uploads stay in this process because the YouTube
+    # client holds authenticated state.
+    shorts = recommendation.shorts
+    total_shorts = len(shorts)
+    final_paths = [
+        video_cutter.short_output_path(videos_output_dir, short, i)
+        for i, short in enumerate(shorts)
+    ]
+    # Finished shorts that are newer than the source and were made with the
+    # same settings are reused as they are
+    pending = [
+        i
+        for i, short in enumerate(shorts)
+        if not video_cutter.skip_if_cached(
+            final_paths[i],
+            settings.refresh,
+            settings.video_path,
+            _effects_cache_key(short, settings),
+        )
+    ]
+
+    cpu_count = os.cpu_count() or 2
+    max_workers = max(1, min(len(pending) or 1, settings.max_workers or cpu_count // 2))
+    # Split the cores between the concurrent ffmpeg processes so their encoder
+    # threads don't oversubscribe the machine.
+    threads = max(1, cpu_count // max_workers)
+
+    cut_paths: list[Path] = []
+    if pending:
+        # Shorts are cut in up to max_workers concurrent ffmpeg processes, each
+        # handling a group of shorts; every short seeks straight to its own clip
+        cut_paths = video_cutter.create_short_videos_batch(
+            input_video=settings.video_path,
+            shorts=[shorts[i] for i in pending],
+            output_dir=videos_output_dir,
+            debug=settings.debug,
+            refresh=settings.refresh,
+            ffmpeg_path=settings.ffmpeg_path,
+            hwaccel=settings.hwaccel,
+            threads=threads,
+            max_workers=max_workers,
+            short_indices=pending,
+        )
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor, tqdm(
+        total=total_shorts,
         desc="Processing shorts",
         unit="short",
         dynamic_ncols=True,
+        mininterval=0.5,
     ) as pbar:
-        for i, short in enumerate(recommendation.shorts):
-            pbar.set_description(f"Processing short {i+1}/{len(recommendation.shorts)}")
-
-            video_path = video_cutter.create_short_video(
-                input_video=settings.video_path,
-                short=short,
-                output_dir=videos_output_dir,
-                short_index=i,
-                debug=settings.debug,
-                refresh=settings.refresh,
-                ffmpeg_path=settings.ffmpeg_path,
-            )
-            pbar.set_postfix(
-                step="Video cut",
-                title=(
-                    short.title[:20] + "..." if len(short.title) > 20 else short.title
-                ),
-            )
-
-            final_path = video_effect_service.apply_effects(
-                short,
+        futures = {
+            executor.submit(
+                _process_one_short,
+                i,
+                shorts[i],
+                cut_path,
+                final_paths[i],
                 settings,
-                video_path,
-                settings.video_effect_strategy,
                 videos_output_dir,
-                short_index=i,
-            )
-            pbar.set_postfix(
-                step="Effects applied",
-                title=(
-                    short.title[:20] + "..." if len(short.title) > 20 else short.title
-                ),
+                threads,
+            ): shorts[i]
+            for i, cut_path in zip(pending, cut_paths)
+        }
+        pending_set = set(pending)
+        cached = (
+            (shorts[i], final_paths[i])
+            for i in range(total_shorts)
+            if i not in pending_set
+        )
+        completed = ((futures[f], f.result()) for f in as_completed(futures))
+        for short, video_path in itertools.chain(cached, completed):
+            short_title = (
+                short.title[:20] + "..." if len(short.title) > 20 else short.title
             )
-            video_path.unlink(missing_ok=True)
-            final_path.rename(video_path)
+            pbar.set_postfix_str(f"Effects applied: {short_title}", refresh=False)
 
             # Upload to YouTube if enabled
             if youtube_service:
-                pbar.set_postfix(
-                    step="Uploading",
-                    title=(
-                        short.title[:20] + "..."
-                        if len(short.title) > 20
-                        else short.title
-                    ),
-                )
+                # Uploads are slow, so show this step right away
+                pbar.set_postfix_str(f"Uploading: {short_title}")
 
                 youtube_service.upload_video(
                     video_path=video_path,
@@ -87,13 +170,8 @@ def process_shorts_with_progress(
                     privacy=settings.youtube_privacy,
                 )
 
+            pbar.set_postfix_str(f"Complete: {short_title}", refresh=False)
             pbar.update(1)
-            pbar.set_postfix(
-                step="Complete",
-                title=(
-                    short.title[:20] + "..." if len(short.title) > 20 else short.title
-                ),
-            )
 
 
 def main():
@@ -106,6 +184,14 @@ def main():
 
     settings.data_dir.mkdir(parents=True, exist_ok=True)
 
+    # Resolve ffmpeg once; worker processes receive the absolute path with settings
+    settings.ffmpeg_path = Path(
+        audio_retriever.resolve_ffmpeg_binary(settings.ffmpeg_path)
+    )
+    settings.video_encoder = video_effect_service.resolve_video_encoder(
+        settings.video_encoder, str(settings.ffmpeg_path)
+    )
+
     youtube_service = None
     if settings.youtube_upload:
         if not settings.youtube_client_id or not settings.youtube_client_secret:
@@ -113,6 +199,8 @@ def main():
                 "YouTube client ID and secret must be provided for uploading."
             )
 
+        from shorts_creator.youtube.youtube import YouTubeService
+
         youtube_service = YouTubeService(
             client_id=settings.youtube_client_id,
             client_secret=settings.youtube_client_secret,
@@ -125,7 +213,7 @@ def main():
 
     audio_file = audio_retriever.retrieve_audio(
         settings.video_path,
-        settings.data_dir / "extracted_audio.mp3",
+        settings.data_dir / "extracted_audio.wav",
         refresh=settings.refresh,
         duration_seconds=settings.duration_seconds,
         start_offset_seconds=settings.start_offset_seconds,
@@ -1,11 +1,22 @@
+from functools import lru_cache
 from pathlib import Path
 import os
 import shutil
+import sys
 import ffmpeg
 import logging
 
+try:
+    import av
+except ImportError:  # PyAV normally comes with faster-whisper
+    av = None
+
 log = logging.getLogger(__name__)
 
+# Source audio codecs that can be stream-copied instead of re-encoded,
+# mapped to the container extension used for the copied track.
+_STREAM_COPY_EXTENSIONS = {"mp3": ".mp3", "aac": ".m4a"}
+
 
 def retrieve_audio(
     video_path: Path,
@@ -22,7 +33,12 @@ def retrieve_audio(
             f"Video file not found: {video_path.resolve() if video_path.is_absolute() else (Path.cwd() / video_path).resolve()}"
         )
 
-    resolved_ffmpeg = _resolve_ffmpeg_binary(ffmpeg_path)
+    resolved_ffmpeg = resolve_ffmpeg_binary(ffmpeg_path)
+
+    source_codec = _probe_audio_codec(video_path, audio_stream_index, resolved_ffmpeg)
+    copy_extension = _STREAM_COPY_EXTENSIONS.get(source_codec or "")
+    if copy_extension:
+        output_file = output_file.with_suffix(copy_extension)
 
     if output_file.exists() and not refresh:
         return output_file
@@ -32,20 +48,49 @@ def retrieve_audio(
             kwargs["ss"] = start_offset_seconds
         if audio_stream_index is not None:
             kwargs["map"] = f"0:a:{audio_stream_index}"
+        elif copy_extension:
+            # Copy exactly the stream that was probed
+            kwargs["map"] = "0:a:0"
         if duration_seconds:
             kwargs["t"] = duration_seconds
 
+        if copy_extension:
+            kwargs["acodec"] = "copy"
+            kwargs["vn"] = None
+        else:
+            # Whisper's native input format, so no re-encode or resample later
+            kwargs["acodec"] = "pcm_s16le"
+            kwargs["ac"] = 1
+            kwargs["ar"] = 16000
+            kwargs["format"] = "wav"
+
         log.info(
-            "Extracting audio: video = %s, output = %s, offset = %ss, duration = %ss, audio_stream = %s, ffmpeg = %s",
+            "Extracting audio: video = %s, output = %s, codec = %s, offset = %ss, duration = %ss, audio_stream = %s, ffmpeg = %s",
             video_path,
             output_file,
+            kwargs["acodec"],
             start_offset_seconds,
             duration_seconds if duration_seconds is not None else "full",
             audio_stream_index if audio_stream_index is not None else "auto",
             resolved_ffmpeg,
         )
+        if not copy_extension and av is not None:
+            try:
+                _retrieve_audio_pyav(
+                    video_path,
+                    output_file,
+                    duration_seconds,
+                    start_offset_seconds,
+                    audio_stream_index,
+                )
+                return output_file
+            except av.error.FFmpegError as e:
+                log.warning(
+                    "PyAV audio extraction failed (%s), falling back to ffmpeg", e
+                )
+
         ffmpeg.input(str(video_path)).output(
-            str(output_file), acodec="libmp3lame", **kwargs
+            str(output_file), **kwargs
         ).overwrite_output().run(quiet=not debug, cmd=resolved_ffmpeg)
 
     except Exception as e:
@@ -61,7 +106,82 @@ def retrieve_audio(
     return output_file
 
 
-def _resolve_ffmpeg_binary(ffmpeg_path: Path | None) -> str:
+def _retrieve_audio_pyav(
+    video_path: Path,
+    output_file: Path,
+    duration_seconds: int | None,
+    start_offset_seconds: int,
+    audio_stream_index: int | None,
+) -> None:
+    """Decode the audio track in-process with PyAV into 16 kHz mono WAV."""
+    end_seconds = (
+        start_offset_seconds + duration_seconds if duration_seconds else None
+    )
+    with av.open(str(video_path)) as in_container, av.open(
+        str(output_file), "w", format="wav"
+    ) as out_container:
+        in_stream = in_container.streams.audio[audio_stream_index or 0]
+        out_stream = out_container.add_stream("pcm_s16le", rate=16000, layout="mono")
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=16000)
+
+        def _encode(frame):
+            for resampled in resampler.resample(frame):
+                out_container.mux(out_stream.encode(resampled))
+
+        if start_offset_seconds:
+            in_container.seek(int(start_offset_seconds * av.time_base))
+
+        for frame in in_container.decode(in_stream):
+            if frame.time is not None:
+                # Seeking lands on the preceding keyframe
+                if frame.time < start_offset_seconds:
+                    continue
+                if end_seconds is not None and frame.time >= end_seconds:
+                    break
+            _encode(frame)
+
+        _encode(None)
+        out_container.mux(out_stream.encode(None))
+
+
+@lru_cache(maxsize=8)
+def _probe_audio_codec(
+    video_path: Path, audio_stream_index: int | None, resolved_ffmpeg: str
+) -> str | None:
+    """Return the codec name of the audio stream that would be extracted."""
+    try:
+        info = ffmpeg.probe(
+            str(video_path),
+            cmd=resolve_ffprobe_binary(resolved_ffmpeg),
+            select_streams=f"a:{audio_stream_index or 0}",
+        )
+    except (ffmpeg.Error, OSError) as e:
+        log.debug("Unable to probe audio codec of %s: %s", video_path, e)
+        return None
+
+    streams = info.get("streams", [])
+    return streams[0].get("codec_name") if streams else None
+
+
+def resolve_ffprobe_binary(resolved_ffmpeg: str) -> str:
+    """Prefer the ffprobe that sits next to the resolved ffmpeg binary."""
+    ffmpeg_binary = Path(resolved_ffmpeg)
+    ffprobe_name = ffmpeg_binary.name.replace("ffmpeg", "ffprobe")
+    # A binary not named like ffmpeg has no recognisable sibling; never hand
+    # back ffmpeg itself as the prober
+    if ffprobe_name != ffmpeg_binary.name:
+        ffprobe_binary = ffmpeg_binary.with_name(ffprobe_name)
+        if ffprobe_binary.exists():
+            return str(ffprobe_binary)
+    return shutil.which("ffprobe") or "ffprobe"
+
+
+@lru_cache(maxsize=4)
+def resolve_ffmpeg_binary(ffmpeg_path: Path | None) -> str:
+    # An explicit, existing path wins without scanning PATH
+    if ffmpeg_path is not None and os.path.exists(ffmpeg_path):
+        return str(Path(ffmpeg_path).resolve())
+
     candidates: list[str] = []
 
     if ffmpeg_path is not None:
@@ -78,12 +198,13 @@ def _resolve_ffmpeg_binary(ffmpeg_path: Path | None) -> str:
         candidates.append(system_ffmpeg)
 
     # Common Windows installation paths
-    common_paths = [
-        "C:\\ffmpeg\\bin\\ffmpeg.exe",
-        "C:\\Program Files\\ffmpeg\\bin\\ffmpeg.exe",
-        "C:\\Program Files (x86)\\ffmpeg\\bin\\ffmpeg.exe",
-    ]
-    candidates.extend(common_paths)
+    if sys.platform == "win32":
+        common_paths = [
+            "C:\\ffmpeg\\bin\\ffmpeg.exe",
+            "C:\\Program Files\\ffmpeg\\bin\\ffmpeg.exe",
+            "C:\\Program Files (x86)\\ffmpeg\\bin\\ffmpeg.exe",
+        ]
+        candidates.extend(common_paths)
 
     for candidate in candidates:
         if candidate and os.path.exists(candidate):
@@ -1,10 +1,15 @@
+import atexit
+import hashlib
 import json
 import logging
+import random
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import httpx
-from openai import OpenAI
+from pydantic_core import from_json
 from shorts_creator.pipeline import storage
 from shorts_creator.domain.models import (
     Speech,
@@ -12,11 +17,20 @@ from shorts_creator.domain.models import (
     YouTubeShortWithSpeech,
     YouTubeShort,
 )
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from shorts_creator.settings.settings import AppSettings
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
 log = logging.getLogger(__name__)
 
+_TEMPERATURE = 0.3
+
+# Adjacent transcript segments are merged into one prompt line until the line
+# spans at least this long, which keeps short utterances from bloating the prompt
+_MIN_LINE_SECONDS = 2.0
+
 
 class YouTubeShortsRecommendationResponse(BaseModel):
     shorts: list[YouTubeShort] = Field(
@@ -26,26 +40,65 @@ class YouTubeShortsRecommendationResponse(BaseModel):
     analysis_summary: str = Field(description="Overall summary of the analysis")
 
 
-def _format_segments_for_analysis(speech: Speech) -> tuple[str, int]:
-    """Format speech segments for LLM analysis."""
-    numbered_segments = []
-    for i, segment in enumerate(speech.segments):
-        duration = segment.end_time - segment.start_time
-        numbered_segments.append(
-            f"Segment {i}: [{segment.start_time:.1f}s-{segment.end_time:.1f}s, {duration:.1f}s duration] {segment.text}"
-        )
+_RESPONSE_SCHEMA = YouTubeShortsRecommendationResponse.model_json_schema()
 
-    segments_text = "\n".join(numbered_segments)
-    total_segments = len(speech.segments)
-    return segments_text, total_segments
+# Statuses the fallback request retries, matching the OpenAI SDK; 5xx also retries
+_RETRY_STATUSES = frozenset({408, 409, 429})
+_RETRY_MAX_DELAY_SECONDS = 8.0
 
+_OPENROUTER_HEADERS = {
+    "HTTP-Referer": "https://github.com/vitalii-honchar/youtube-shorts-creator",
+    "X-Title": "YouTube Shorts Creator",
+}
 
-def _create_system_prompt(
-    max_shorts: int,
-    max_duration_seconds: float,
-) -> str:
-    """Create the system prompt for YouTube shorts analysis."""
-    return f"""
+
+def _group_segments(speech: Speech) -> list[tuple[int, int]]:
+    """Group adjacent speech segments into prompt lines.
+
+    Returns the (first, last) inclusive segment indices of every line.
+    """
+    groups: list[tuple[int, int]] = []
+    first = 0
+    for i, segment in enumerate(speech.segments):
+        if segment.end_time - speech.segments[first].start_time >= _MIN_LINE_SECONDS:
+            groups.append((first, i))
+            first = i + 1
+    if first < len(speech.segments):
+        groups.append((first, len(speech.segments) - 1))
+    return groups
+
+
+def _format_segments_for_analysis(
+    speech: Speech, groups: list[tuple[int, int]], max_chars: int | None
+) -> tuple[str, int]:
+    """Format grouped speech segments for LLM analysis."""
+    segments = speech.segments
+    lines = []
+    used_chars = 0
+    for n, (first, last) in enumerate(groups):
+        text = " ".join(s.text for s in segments[first : last + 1])
+        line = f"[{segments[first].start_time:.1f}-{segments[last].end_time:.1f}] {n}: {text}"
+        used_chars += len(line) + 1
+        if max_chars is not None and used_chars > max_chars:
+            if not lines:
+                raise ValueError(
+                    f"llm_max_transcript_chars={max_chars} is smaller than the first "
+                    f"transcript line ({len(line)} characters); raise it or unset it"
+                )
+            log.warning(
+                "Transcript exceeds %s characters, dropping %s of %s lines "
+                "and sending only the first %s",
+                max_chars,
+                len(groups) - n,
+                len(groups),
+                n,
+            )
+            break
+        lines.append(line)
+    return "\n".join(lines), len(lines)
+
+
+_SYSTEM_PROMPT_TEMPLATE = """
 You are an expert YouTube Shorts content creator specializing in identifying the most engaging segments from long-form video transcripts. Your task is to analyze video transcripts and extract segments that would make compelling YouTube Shorts.
 
 ## PRIMARY OBJECTIVE
@@ -92,13 +145,24 @@ For each identified segment, provide:
 - Use overlapping segments or combine adjacent content if needed to meet minimum duration of {max_duration_seconds} seconds
 
 ## CONTENT ANALYSIS INSTRUCTIONS
-The video transcript will be provided wrapped in <VIDEO_TRANSCRIPT></VIDEO_TRANSCRIPT> tags. Each segment includes timing information in the format:
-"Segment N: [start_time-end_time, duration] transcript_text"
+The video transcript will be provided wrapped in <VIDEO_TRANSCRIPT></VIDEO_TRANSCRIPT> tags. Each line is one segment with its timing in seconds in the format:
+"[start_time-end_time] N: transcript_text"
 
-Use timing information to estimate durations and ensure segments meet the minimum {max_duration_seconds}-second requirement (with up to 20-30% overage allowed).
+where N is the segment number. A segment's duration is end_time minus start_time. Use timing information to estimate durations and ensure segments meet the minimum {max_duration_seconds}-second requirement (with up to 20-30% overage allowed).
 """
 
 
+@lru_cache(maxsize=8)
+def _create_system_prompt(
+    max_shorts: int,
+    max_duration_seconds: float,
+) -> str:
+    """Create the system prompt for YouTube shorts analysis."""
+    return _SYSTEM_PROMPT_TEMPLATE.format(
+        max_shorts=max_shorts, max_duration_seconds=max_duration_seconds
+    )
+
+
 def _create_user_prompt(segments_text: str, total_segments: int) -> str:
     """Create the user prompt with the video transcript."""
     return f"""
@@ -112,20 +176,60 @@ Total segments available: {total_segments} (numbered 0 to {total_segments-1})
 """
 
 
+def _build_messages(
+    system_prompt: str, user_prompt: str, settings: AppSettings
+) -> list[dict[str, Any]]:
+    system_content: str | list[dict[str, Any]] = system_prompt
+    if "anthropic" in settings.model_name or "anthropic" in settings.openai_base_url:
+        # Anthropic models only cache prompt prefixes that are marked explicitly;
+        # OpenAI models cache identical prefixes automatically.
+        system_content = [
+            {
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+    return [
+        {"role": "system", "content": system_content},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+@lru_cache(maxsize=4)
+def _get_openai_client(
+    api_key: str, base_url: str, timeout: float, max_retries: int
+) -> "OpenAI":
+    from openai import OpenAI
+
+    # The SDK retries connection errors, 408/409/429 and 5xx responses with
+    # jittered exponential backoff. It shares the keep-alive connection pool
+    # with the manual fallback.
+    return OpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        timeout=timeout,
+        max_retries=max_retries,
+        http_client=_get_http_client(),
+    )
+
+
 def _call_openai_api(
     system_prompt: str, user_prompt: str, settings: AppSettings
 ) -> YouTubeShortsRecommendationResponse:
-    client = OpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url)
+    client = _get_openai_client(
+        settings.openai_api_key,
+        settings.openai_base_url,
+        settings.openai_timeout_seconds,
+        settings.openai_max_retries,
+    )
 
     try:
         response = client.beta.chat.completions.parse(
             model=settings.model_name,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
+            messages=_build_messages(system_prompt, user_prompt, settings),
             response_format=YouTubeShortsRecommendationResponse,
-            temperature=0.3,
+            temperature=_TEMPERATURE,
         )
 
         analysis = response.choices[0].message.parsed
@@ -155,6 +259,66 @@ def _call_openai_api(
     return _parse_completion_response(completion_data)
 
 
+def _retry_delay(attempt: int, response: httpx.Response | None) -> float:
+    if response is not None:
+        try:
+            return min(
+                float(response.headers["retry-after"]), _RETRY_MAX_DELAY_SECONDS
+            )
+        except (KeyError, ValueError):
+            pass
+    # Jittered exponential backoff, like the SDK
+    delay = min(0.5 * 2**attempt, _RETRY_MAX_DELAY_SECONDS)
+    return delay * (1 - 0.25 * random.random())
+
+
+def _post_with_retries(
+    url: str, headers: dict[str, str], payload: dict[str, Any], settings: AppSettings
+) -> httpx.Response:
+    """POST with the same timeout and transient-error retries as the SDK client."""
+    attempt = 0
+    while True:
+        response = None
+        try:
+            response = _get_http_client().post(
+                url,
+                headers=headers,
+                json=payload,
+                timeout=settings.openai_timeout_seconds,
+            )
+        except httpx.TransportError as http_error:
+            if attempt >= settings.openai_max_retries:
+                raise RuntimeError(
+                    "Failed to contact OpenAI-compatible API"
+                ) from http_error
+            log.warning("API request failed (%s), retrying", http_error)
+        except httpx.HTTPError as http_error:
+            raise RuntimeError(
+                "Failed to contact OpenAI-compatible API"
+            ) from http_error
+        else:
+            transient = (
+                response.status_code in _RETRY_STATUSES or response.status_code >= 500
+            )
+            if not transient or attempt >= settings.openai_max_retries:
+                return response
+            log.warning("API returned status %s, retrying", response.status_code)
+
+        time.sleep(_retry_delay(attempt, response))
+        attempt += 1
+
+
+@lru_cache(maxsize=1)
+def _get_http_client() -> httpx.Client:
+    # Shared client so retries and fallbacks reuse the open TLS connection
+    client = httpx.Client(
+        timeout=httpx.Timeout(120.0),
+        limits=httpx.Limits(max_keepalive_connections=4),
+    )
+    atexit.register(client.close)
+    return client
+
+
 def _request_chat_completion_via_httpx(
     system_prompt: str, user_prompt: str, settings: AppSettings
 ) -> dict[str, Any]:
@@ -167,33 +331,22 @@ def _request_chat_completion_via_httpx(
     }
 
     if "openrouter.ai" in base_url:
-        headers.setdefault(
-            "HTTP-Referer", "https://github.com/vitalii-honchar/youtube-shorts-creator"
-        )
-        headers.setdefault("X-Title", "YouTube Shorts Creator")
-
-    schema = YouTubeShortsRecommendationResponse.model_json_schema()
+        headers.update(_OPENROUTER_HEADERS)
 
     payload: dict[str, Any] = {
         "model": settings.model_name,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        "temperature": 0.3,
+        "messages": _build_messages(system_prompt, user_prompt, settings),
+        "temperature": _TEMPERATURE,
         "response_format": {
             "type": "json_schema",
             "json_schema": {
                 "name": "YouTubeShortsRecommendationResponse",
-                "schema": schema,
+                "schema": _RESPONSE_SCHEMA,
             },
         },
     }
 
-    try:
-        response = httpx.post(url, headers=headers, json=payload, timeout=120)
-    except httpx.HTTPError as http_error:
-        raise RuntimeError("Failed to contact OpenAI-compatible API") from http_error
+    response = _post_with_retries(url, headers, payload, settings)
 
     content_type = response.headers.get("content-type", "")
     body_preview = response.text[:500]
@@ -233,8 +386,8 @@ def _request_chat_completion_via_httpx(
         )
 
     try:
-        data = response.json()
-    except json.JSONDecodeError as json_error:
+        data = from_json(response.content)
+    except ValueError as json_error:
         log.error(
             "Unable to parse API JSON response. Snippet: %s", body_preview
         )
@@ -285,25 +438,29 @@ def _parse_analysis_from_text(text_content: str) -> YouTubeShortsRecommendationR
         )
 
     try:
-        parsed_payload = json.loads(text_content)
-    except json.JSONDecodeError as json_error:
+        return YouTubeShortsRecommendationResponse.model_validate_json(text_content)
+    except ValidationError as validation_error:
+        if not any(e["type"] == "json_invalid" for e in validation_error.errors()):
+            raise
         log.error(
             "Failed to decode LLM response as JSON. Response snippet: %s",
             text_content[:500],
         )
-        raise ValueError("Unable to decode OpenAI response as JSON") from json_error
-
-    return YouTubeShortsRecommendationResponse.model_validate(parsed_payload)
+        raise ValueError(
+            "Unable to decode OpenAI response as JSON"
+        ) from validation_error
 
 
 def _add_timestamps_to_shorts(
-    analysis: YouTubeShortsRecommendationResponse, speech: Speech
+    analysis: YouTubeShortsRecommendationResponse,
+    speech: Speech,
+    groups: list[tuple[int, int]],
 ) -> YouTubeShortsRecommendation:
     shorts = []
     for short in analysis.shorts:
         if (
             short.start_segment_index < 0
-            or short.end_segment_index >= len(speech.segments)
+            or short.end_segment_index >= len(groups)
             or short.start_segment_index > short.end_segment_index
         ):
             log.warning(
@@ -311,15 +468,20 @@ def _add_timestamps_to_shorts(
             )
             continue
 
-        short_with_speech = YouTubeShortWithSpeech.model_validate(
-            {
-                **short.model_dump(),
-                "speech": speech.segments[
-                    short.start_segment_index : short.end_segment_index + 1
-                ],
-                "start_time": speech.segments[short.start_segment_index].start_time,
-                "end_time": speech.segments[short.end_segment_index].end_time,
-            }
+        # The LLM answers in prompt line numbers; map them back to segments
+        first = groups[short.start_segment_index][0]
+        last = groups[short.end_segment_index][1]
+
+        # Both inputs are already validated models, so skip re-validation
+        short_with_speech = YouTubeShortWithSpeech.model_construct(
+            **{
+                **dict(short),
+                "start_segment_index": first,
+                "end_segment_index": last,
+            },
+            speech=speech.segments[first : last + 1],
+            start_time=speech.segments[first].start_time,
+            end_time=speech.segments[last].end_time,
         )
         shorts.append(short_with_speech)
 
@@ -330,22 +492,49 @@ def _add_timestamps_to_shorts(
     )
 
 
+def _prompt_cache_key(
+    system_prompt: str, user_prompt: str, settings: AppSettings
+) -> str:
+    digest = hashlib.sha256()
+    for part in (settings.model_name, str(_TEMPERATURE), system_prompt, user_prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
 def generate_youtube_shorts_recommendations(
     speech: Speech,
     settings: AppSettings,
     output_file: Path,
 ) -> YouTubeShortsRecommendation:
-    if output_file.exists() and not settings.refresh:
-        return YouTubeShortsRecommendation.model_validate_json(
-            storage.read(output_file)
-        )
-    segments_text, total_segments = _format_segments_for_analysis(speech)
+    groups = _group_segments(speech)
+    segments_text, total_segments = _format_segments_for_analysis(
+        speech, groups, settings.llm_max_transcript_chars
+    )
+    groups = groups[:total_segments]
     system_prompt = _create_system_prompt(
         settings.shorts_number,
         settings.short_duration_seconds * settings.speed_factor,
     )
     user_prompt = _create_user_prompt(segments_text, total_segments)
-    analysis = _call_openai_api(system_prompt, user_prompt, settings)
-    res = _add_timestamps_to_shorts(analysis, speech)
-    storage.save(output_file, res.model_dump_json(indent=2))
+
+    # Keyed by everything sent to the model, so a changed transcript, prompt or
+    # setting is never served a stale answer
+    cache_file = (
+        settings.data_dir
+        / "llm_cache"
+        / f"{_prompt_cache_key(system_prompt, user_prompt, settings)}.json"
+    )
+    if not settings.refresh and cache_file.exists():
+        log.debug(f"Using cached LLM response: {cache_file}")
+        analysis = YouTubeShortsRecommendationResponse.model_validate_json(
+            storage.read_bytes(cache_file)
+        )
+    else:
+        analysis = _call_openai_api(system_prompt, user_prompt, settings)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        storage.save(cache_file, analysis, durable=settings.durable_writes)
+
+    res = _add_timestamps_to_shorts(analysis, speech, groups)
+    storage.save(output_file, res, durable=settings.durable_writes)
     return res
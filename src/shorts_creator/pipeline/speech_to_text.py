@@ -1,6 +1,11 @@
+import contextlib
 import logging
+import os
+import queue
+import threading
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
 from pathlib import Path
-from faster_whisper import WhisperModel
 from tqdm import tqdm
 from shorts_creator.domain.models import Speech, SpeechSegment
 from shorts_creator.pipeline import storage
@@ -8,45 +13,168 @@ from shorts_creator.settings.settings import AppSettings
 
 log = logging.getLogger(__name__)
 
+# Model sizes that ship an English-only ".en" checkpoint
+_ENGLISH_ONLY_SIZES = {"tiny", "base", "small", "medium"}
+
+
+def _resolve_whisper_device(settings: AppSettings) -> tuple[str, str]:
+    """Pick the CTranslate2 device and compute type, preferring a CUDA GPU."""
+    import ctranslate2
+
+    device = settings.whisper_device
+    if device == "auto":
+        device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+    compute_type = settings.whisper_compute_type
+    if compute_type is None:
+        compute_type = "int8"
+        if device == "cuda":
+            # Older GPUs lack fast float16; int8 weights with float16 compute
+            # is the next best option
+            supported = ctranslate2.get_supported_compute_types("cuda")
+            for candidate in ("float16", "int8_float16"):
+                if candidate in supported:
+                    compute_type = candidate
+                    break
+
+    return device, compute_type
+
+
+def _resolve_whisper_model_name(settings: AppSettings) -> str:
+    """Use the smaller English-only checkpoint when transcribing English."""
+    if (
+        settings.whisper_language == "en"
+        and settings.whisper_model_size in _ENGLISH_ONLY_SIZES
+    ):
+        return f"{settings.whisper_model_size}.en"
+    return settings.whisper_model_size
+
+
+_PREFETCH_DONE = object()
+
+
+def _prefetch(items: Iterable, maxsize: int = 64) -> Iterator:
+    """Iterate items on a background thread, buffering up to maxsize ahead."""
+    buffer: queue.Queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def _put(item) -> bool:
+        # Wake up regularly so an abandoned consumer doesn't block this thread
+        # (and the model and generator it holds) forever
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce():
+        try:
+            for item in items:
+                if not _put(item):
+                    return
+        except BaseException as e:
+            _put(e)
+        else:
+            _put(_PREFETCH_DONE)
+
+    threading.Thread(target=_produce, daemon=True).start()
+    try:
+        while (item := buffer.get()) is not _PREFETCH_DONE:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+@lru_cache(maxsize=4)
+def _get_model(
+    model_name: str,
+    device: str,
+    compute_type: str,
+    cpu_threads: int,
+    flash_attention: bool,
+):
+    """Load a faster-whisper model once per process and reuse it."""
+    from faster_whisper import WhisperModel
+
+    return WhisperModel(
+        model_name,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        flash_attention=flash_attention,
+    )
+
 
 def convert_speech_to_text(
     audio_file: Path, output_file: Path, settings: AppSettings
 ) -> Speech:
-    if output_file.exists() and not settings.refresh:
-        return Speech.model_validate_json(storage.read(output_file))
+    if not settings.refresh and output_file.exists():
+        return Speech.model_validate_json(storage.read_bytes(output_file))
+
+    model_name = _resolve_whisper_model_name(settings)
+    device, compute_type = _resolve_whisper_device(settings)
+    log.info(f"Loading faster-whisper model: {model_name} ({device}, {compute_type})")
 
-    log.info(f"Loading faster-whisper model: {settings.whisper_model_size}")
+    # Imported here: faster-whisper pulls in ctranslate2 and onnxruntime, which
+    # only the transcription step needs
+    from faster_whisper import BatchedInferencePipeline
 
     try:
-        model = WhisperModel(
-            settings.whisper_model_size, device="cpu", compute_type="int8"
+        model = _get_model(
+            model_name,
+            device,
+            compute_type,
+            cpu_threads=os.cpu_count() or 0,
+            flash_attention=settings.whisper_flash_attention and device == "cuda",
         )
 
         log.info(f"Transcribing audio from {audio_file}")
 
-        # Transcribe audio with word-level timestamps
-        segments, info = model.transcribe(
-            str(audio_file),
+        transcribe_kwargs = dict(
             beam_size=5,
             word_timestamps=True,
             vad_filter=True,
             vad_parameters=dict(min_silence_duration_ms=500),
-            language="ru",
+            language=settings.whisper_language,
         )
 
+        # Transcribe audio with word-level timestamps. The batched pipeline
+        # splits the audio into VAD chunks and decodes them in parallel. It
+        # drops timestamp tokens by default and returns one segment per chunk;
+        # keeping them splits chunks closer to sentence boundaries.
+        if settings.whisper_batch_size > 1:
+            pipeline = BatchedInferencePipeline(model=model)
+            segments, info = pipeline.transcribe(
+                str(audio_file),
+                batch_size=settings.whisper_batch_size,
+                without_timestamps=False,
+                **transcribe_kwargs,
+            )
+        else:
+            segments, info = model.transcribe(str(audio_file), **transcribe_kwargs)
+
         # Process segments and build Speech object
         log.info("Processing transcription segments...")
         speech_segments = []
 
         offset = settings.start_offset_seconds
 
+        # faster-whisper decodes lazily as the generator is consumed; pulling it
+        # on another thread keeps CTranslate2 (which releases the GIL) decoding
+        # while this loop builds models and updates progress. Closing the
+        # prefetcher stops that thread if the loop exits early.
         with tqdm(
             total=info.duration,
             desc="Processing segments",
             unit="s",
             dynamic_ncols=True,
-        ) as pbar:
-            for segment in segments:
+            mininterval=0.5,
+        ) as pbar, contextlib.closing(_prefetch(segments)) as prefetched:
+            for segment in prefetched:
                 speech_segment = SpeechSegment(
                     start_time=segment.start + offset,
                     end_time=segment.end + offset,
@@ -56,9 +184,11 @@ def convert_speech_to_text(
 
                 current_time = int(segment.end)
                 progress = min(current_time, info.duration)
-                pbar.n = progress
-                pbar.set_postfix(time=f"{segment.end:.1f}s/{info.duration:.1f}s")
-                pbar.refresh()
+                pbar.set_postfix_str(
+                    f"time={segment.end:.1f}s/{info.duration:.1f}s", refresh=False
+                )
+                # update() only redraws once mininterval has passed
+                pbar.update(progress - pbar.n)
 
         speech = Speech(
             language=info.language,
@@ -70,7 +200,7 @@ def convert_speech_to_text(
             f"Transcription completed: {len(speech_segments)} segments, {info.duration:.1f}s duration"
         )
 
-        storage.save(output_file, speech.model_dump_json(indent=2))
+        storage.save(output_file, speech, durable=settings.durable_writes)
         return speech
 
     except FileNotFoundError:
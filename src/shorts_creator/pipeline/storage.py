@@ -1,16 +1,47 @@
 from pathlib import Path
-import json
+import os
 from typing import Any
 
+from pydantic import BaseModel
+from pydantic_core import from_json, to_json
 
-def save(path: Path, data: dict[str, Any] | str) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        if isinstance(data, str):
-            f.write(data)
-        else:
-            json.dump(data, f, ensure_ascii=False)
+
+def save(
+    path: Path,
+    data: BaseModel | dict[str, Any] | str | bytes,
+    pretty: bool = False,
+    durable: bool = False,
+) -> None:
+    indent = 2 if pretty else None
+    if isinstance(data, BaseModel):
+        payload = data.model_dump_json(indent=indent).encode("utf-8")
+    elif isinstance(data, str):
+        payload = data.encode("utf-8")
+    elif isinstance(data, bytes):
+        payload = data
+    else:
+        payload = to_json(data, indent=indent)
+
+    # Write to a sibling temp file and swap it in, so a crash never leaves a
+    # truncated cache file behind
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
 
 
 def read(path: Path) -> str:
     with open(path, encoding="utf-8") as f:
         return f.read()
+
+
+def read_bytes(path: Path) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def read_json(path: Path) -> Any:
+    return from_json(read_bytes(path))
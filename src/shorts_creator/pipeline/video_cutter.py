@@ -1,13 +1,32 @@
+import bisect
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
 
 import ffmpeg
+from tqdm import tqdm
 
 from shorts_creator.domain.models import YouTubeShortWithSpeech, Speech
-from shorts_creator.pipeline.audio_retriever import _resolve_ffmpeg_binary
+from shorts_creator.pipeline import storage
+from shorts_creator.pipeline.audio_retriever import (
+    resolve_ffmpeg_binary,
+    resolve_ffprobe_binary,
+)
 
 log = logging.getLogger(__name__)
 
+# Cuts are re-encoded again when effects are applied, so they are encoded as
+# fast as possible at a quality high enough to survive the second pass
+_CUT_PRESET = "ultrafast"
+_CUT_CRF = 18
+
+# A short whose start lies at most this far after a keyframe is stream-copied
+# from that keyframe. The cut then starts early, so its real start is recorded
+# in the sidecar and captions are offset from it (see read_cut_start)
+_KEYFRAME_SNAP_TOLERANCE = 0.1
+
 
 def create_subtitle_file(
     speech: Speech, start_time: float, end_time: float, output_path: Path
@@ -22,104 +41,326 @@ def create_subtitle_file(
     return srt_path
 
 
-def cut_video_segment_with_effects(
-    input_video: Path,
-    output_video: Path,
-    start_time: float,
-    end_time: float,
-    debug: bool,
-    ffmpeg_path: Path | None,
+def short_output_path(
+    output_dir: Path, short: YouTubeShortWithSpeech, short_index: int
+) -> Path:
+    return (
+        output_dir
+        / f"short_{short_index + 1}_{short.start_time:.0f}s-{short.end_time:.0f}s.mp4"
+    )
+
+
+def _short_cut_path(
+    output_dir: Path, short: YouTubeShortWithSpeech, short_index: int
 ) -> Path:
-    """Cut a clean video segment only.
+    """Intermediate cut, kept apart from the final short so effects never stack."""
+    final_path = short_output_path(output_dir, short, short_index)
+    return final_path.with_name(f"{final_path.stem}_cut{final_path.suffix}")
 
-    Effects and formatting to 9:16 are applied later in video_effecter.
+
+def _cache_key_path(output_path: Path) -> Path:
+    return output_path.with_suffix(".json")
+
+
+def _cut_cache_key(
+    input_video: Path, short: YouTubeShortWithSpeech, hwaccel: str | None
+) -> dict[str, Any]:
+    return {
+        "input": str(input_video),
+        "start": short.start_time,
+        "end": short.end_time,
+        "hwaccel": hwaccel,
+    }
+
+
+def skip_if_cached(
+    output_path: Path,
+    refresh: bool,
+    input_video: Path,
+    cache_key: dict[str, Any] | None = None,
+) -> bool:
+    """Return True if output_path is up to date and can be reused.
+
+    The output must be newer than input_video and, when cache_key is given, the
+    sidecar .json written next to it must hold the same key. Extra fields saved
+    in the sidecar are not part of the key.
     """
+    if refresh or not output_path.exists():
+        return False
+    try:
+        if output_path.stat().st_mtime <= input_video.stat().st_mtime:
+            log.debug(f"Output is older than its input, regenerating: {output_path}")
+            return False
+    except OSError:
+        return False
+    if cache_key is None:
+        return True
     try:
+        saved = storage.read_json(_cache_key_path(output_path))
+    except (OSError, ValueError):
+        return False
+    return isinstance(saved, dict) and all(
+        saved.get(key) == value for key, value in cache_key.items()
+    )
+
 
-        if not input_video.exists():
-            raise FileNotFoundError(f"Input video not found: {input_video}")
+def save_cache_key(output_path: Path, cache_key: dict[str, Any]) -> None:
+    storage.save(_cache_key_path(output_path), cache_key)
 
-        resolved_ffmpeg = _resolve_ffmpeg_binary(ffmpeg_path)
-        log.debug(f"Using ffmpeg binary: {resolved_ffmpeg}")
 
-        # Ensure output directory exists
-        output_video.parent.mkdir(parents=True, exist_ok=True)
+def read_cut_start(cut_path: Path, default: float) -> float:
+    """Source time the cut actually starts at, which is earlier than the short's
+    start when it was stream-copied from a keyframe."""
+    try:
+        return float(storage.read_json(_cache_key_path(cut_path))["cut_start"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return default
 
-        # Accurate cut with black frame removal
-        duration = end_time - start_time
 
-        # Use more precise seeking and add black frame detection
-        input_stream = ffmpeg.input(str(input_video))
+def remove_cached(output_path: Path) -> None:
+    output_path.unlink(missing_ok=True)
+    _cache_key_path(output_path).unlink(missing_ok=True)
 
-        # Apply precise trimming with black frame removal
-        video = input_stream.video.filter(
-            "trim", start=start_time, duration=duration
-        ).filter(
-            "setpts", "PTS-STARTPTS"
-        )  # Reset timestamps to avoid black frames
 
-        audio = input_stream.audio.filter(
-            "atrim", start=start_time, duration=duration
-        ).filter(
-            "asetpts", "PTS-STARTPTS"
-        )  # Reset audio timestamps
+@lru_cache(maxsize=8)
+def _keyframe_times(input_video: Path, resolved_ffmpeg: str) -> tuple[float, ...]:
+    """Return the sorted keyframe timestamps of the first video stream.
+
+    Times are relative to the container's start time, like an input-side -ss.
+    """
+    try:
+        # Packet flags mark keyframes without decoding any frames
+        info = ffmpeg.probe(
+            str(input_video),
+            cmd=resolve_ffprobe_binary(resolved_ffmpeg),
+            select_streams="v:0",
+            show_entries="packet=pts_time,flags:format=start_time",
+        )
+    except (ffmpeg.Error, OSError) as e:
+        log.debug("Unable to probe keyframes of %s: %s", input_video, e)
+        return ()
+
+    # MPEG-TS and many remuxes start at a nonzero timestamp, while -ss seeks
+    # relative to it
+    try:
+        start_time = float(info["format"]["start_time"])
+    except (KeyError, TypeError, ValueError):
+        start_time = 0.0
 
-        output_stream = ffmpeg.output(
-            video,
-            audio,
-            str(output_video),
-            vcodec="libx264",
-            acodec="aac",
+    keyframes = []
+    for packet in info.get("packets", []):
+        if "K" not in packet.get("flags", ""):
+            continue
+        try:
+            keyframes.append(float(packet["pts_time"]) - start_time)
+        except (KeyError, ValueError):
+            continue
+    return tuple(sorted(keyframes))
+
+
+def _keyframe_at_or_before(
+    keyframes: tuple[float, ...], time: float
+) -> float | None:
+    # keyframes is sorted, so a binary search finds the nearest one
+    i = bisect.bisect_right(keyframes, time)
+    return keyframes[i - 1] if i else None
+
+
+def _log_ffmpeg_error(message: str, e: ffmpeg.Error) -> None:
+    stdout = e.stdout.decode(errors="ignore") if e.stdout else ""
+    stderr = e.stderr.decode(errors="ignore") if e.stderr else ""
+    log.error(
+        "%s\nSTDOUT:\n%s\nSTDERR:\n%s", message, stdout.strip(), stderr.strip()
+    )
+
+
+def _copy_cut(
+    input_video: Path,
+    short: YouTubeShortWithSpeech,
+    path: Path,
+    keyframe: float,
+    debug: bool,
+    resolved_ffmpeg: str,
+) -> bool:
+    """Remux a short from the keyframe at its start. Returns False on failure."""
+    log.debug(f"Stream-copying {path.name} from keyframe at {keyframe:.3f}s")
+    copy_input = ffmpeg.input(
+        str(input_video), ss=keyframe, t=short.end_time - keyframe
+    )
+    try:
+        ffmpeg.output(
+            copy_input.video,
+            copy_input.audio,
+            str(path),
+            vcodec="copy",
+            acodec="copy",
             movflags="+faststart",
+            avoid_negative_ts="make_zero",
+        ).run(overwrite_output=True, quiet=not debug, cmd=resolved_ffmpeg)
+    except ffmpeg.Error as e:
+        # Some source codecs can't go into MP4 as they are
+        log.warning(f"Stream copy of {path.name} failed, re-encoding it instead")
+        log.debug("ffmpeg stderr: %s", (e.stderr or b"").decode(errors="ignore"))
+        path.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def _cut_group(
+    input_video: Path,
+    group: list[tuple[YouTubeShortWithSpeech, Path]],
+    keyframes: tuple[float, ...],
+    debug: bool,
+    resolved_ffmpeg: str,
+    hwaccel: str | None,
+    threads: int | None,
+) -> None:
+    """Cut a group of shorts.
+
+    Shorts starting on a keyframe are remuxed one by one, so a failed copy only
+    falls back for that short. The rest are re-encoded by one ffmpeg invocation.
+    """
+    input_kwargs = {"hwaccel": hwaccel} if hwaccel else {}
+
+    outputs = []
+    reencoded = []
+    for short, path in group:
+        keyframe = _keyframe_at_or_before(keyframes, short.start_time)
+        if (
+            keyframe is not None
+            and short.start_time - keyframe <= _KEYFRAME_SNAP_TOLERANCE
+            and _copy_cut(input_video, short, path, keyframe, debug, resolved_ffmpeg)
+        ):
+            save_cache_key(
+                path,
+                {**_cut_cache_key(input_video, short, hwaccel), "cut_start": keyframe},
+            )
+            continue
+
+        # Each short seeks on its own input, so only its own clip is decoded
+        reencoded.append((short, path))
+        input_stream = ffmpeg.input(
+            str(input_video),
+            ss=short.start_time,
+            t=short.end_time - short.start_time,
+            **input_kwargs,
         )
+        outputs.append(
+            ffmpeg.output(
+                input_stream.video,
+                input_stream.audio,
+                str(path),
+                vcodec="libx264",
+                preset=_CUT_PRESET,
+                crf=_CUT_CRF,
+                acodec="aac",
+                movflags="+faststart",
+                avoid_negative_ts="make_zero",
+                threads=threads or 0,
+            )
+        )
+
+    if not outputs:
+        return
 
-        ffmpeg.run(
-            output_stream,
+    try:
+        ffmpeg.merge_outputs(*outputs).run(
             overwrite_output=True,
             quiet=not debug,
             cmd=resolved_ffmpeg,
         )
-
-        return output_video
-
     except ffmpeg.Error as e:
-        stdout = e.stdout.decode(errors="ignore") if e.stdout else ""
-        stderr = e.stderr.decode(errors="ignore") if e.stderr else ""
-        log.error(
-            "FFmpeg error while cutting video.\nSTDOUT:\n%s\nSTDERR:\n%s",
-            stdout.strip(),
-            stderr.strip(),
-        )
-        raise
-    except Exception as e:
-        log.error(f"Error cutting video: {e}")
+        _log_ffmpeg_error("FFmpeg error while cutting videos.", e)
         raise
 
+    for short, path in reencoded:
+        save_cache_key(
+            path,
+            {
+                **_cut_cache_key(input_video, short, hwaccel),
+                "cut_start": short.start_time,
+            },
+        )
+
 
-def create_short_video(
+def create_short_videos_batch(
     input_video: Path,
-    short: YouTubeShortWithSpeech,
+    shorts: list[YouTubeShortWithSpeech],
     output_dir: Path,
-    short_index: int,
     debug: bool,
     refresh: bool,
     ffmpeg_path: Path | None,
-) -> Path:
-    """Create an enhanced short video from a YouTubeShort analysis result."""
-    output_filename = (
-        f"short_{short_index + 1}_{short.start_time:.0f}s-{short.end_time:.0f}s.mp4"
-    )
-    output_path = output_dir / output_filename
-
-    if output_path.exists() and not refresh:
-        log.debug(f"Short video already exists, skipping: {output_path}")
-        return output_path
-
-    return cut_video_segment_with_effects(
-        input_video=input_video,
-        output_video=output_path,
-        start_time=short.start_time,
-        end_time=short.end_time,
-        debug=debug,
-        ffmpeg_path=ffmpeg_path,
+    hwaccel: str | None = None,
+    threads: int | None = None,
+    max_workers: int = 1,
+    short_indices: list[int] | None = None,
+) -> list[Path]:
+    """Cut all shorts from the source video.
+
+    Shorts that start on a keyframe are remuxed without re-encoding. The rest
+    are re-encoded from an input-side seek, so only the clip itself is decoded.
+    Shorts are sorted by start time and split into up to max_workers groups that
+    run concurrently; the re-encoded shorts of a group share one ffmpeg process.
+
+    short_indices gives each short's position in the full recommendation, which
+    names its file; it defaults to the position in shorts.
+    """
+    if short_indices is None:
+        short_indices = list(range(len(shorts)))
+    output_paths = [
+        _short_cut_path(output_dir, short, i)
+        for i, short in zip(short_indices, shorts)
+    ]
+    pending = [
+        (short, path)
+        for short, path in zip(shorts, output_paths)
+        if not skip_if_cached(
+            path, refresh, input_video, _cut_cache_key(input_video, short, hwaccel)
+        )
+    ]
+    if not pending:
+        log.debug("All short videos already exist, skipping cut")
+        return output_paths
+
+    if not input_video.exists():
+        raise FileNotFoundError(f"Input video not found: {input_video}")
+
+    resolved_ffmpeg = resolve_ffmpeg_binary(ffmpeg_path)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    keyframes = _keyframe_times(input_video, resolved_ffmpeg)
+
+    pending.sort(key=lambda item: item[0].start_time)
+    group_count = max(1, min(max_workers, len(pending)))
+    group_size = -(-len(pending) // group_count)
+    groups = [
+        pending[i : i + group_size] for i in range(0, len(pending), group_size)
+    ]
+
+    log.debug(
+        f"Cutting {len(pending)} shorts from {input_video} in {len(groups)} groups"
     )
+    # ffmpeg does the work in subprocesses, so threads are enough here
+    with ThreadPoolExecutor(max_workers=len(groups)) as executor, tqdm(
+        total=len(pending),
+        desc="Cutting shorts",
+        unit="short",
+        dynamic_ncols=True,
+    ) as pbar:
+        futures = {
+            executor.submit(
+                _cut_group,
+                input_video,
+                group,
+                keyframes,
+                debug,
+                resolved_ffmpeg,
+                hwaccel,
+                threads,
+            ): len(group)
+            for group in groups
+        }
+        for future in as_completed(futures):
+            future.result()
+            pbar.update(futures[future])
+
+    return output_paths
@@ -10,6 +10,9 @@ class AppSettings(BaseSettings):
     openai_api_key: str
     openai_base_url: str = "https://openrouter.ai/api/v1"
     model_name: str = "openai/gpt-5-mini"
+    openai_timeout_seconds: float = 120.0
+    openai_max_retries: int = 5
+    llm_max_transcript_chars: int | None = None
     data_dir: Path = Path("shorts-creator")
     refresh: bool = True
     video_path: Path
@@ -19,8 +22,15 @@ class AppSettings(BaseSettings):
     short_duration_seconds: int = 60
     speed_factor: float = 1.35
     whisper_model_size: Literal["tiny", "base", "small", "medium", "large"] = "medium"
+    whisper_language: str = "ru"
+    # Batched inference is faster but yields coarser segments, see --whisper-batch-size
+    whisper_batch_size: int = 1
+    whisper_device: Literal["auto", "cpu", "cuda"] = "auto"
+    whisper_compute_type: str | None = None
+    whisper_flash_attention: bool = False
     video_effect_strategy: VideoEffectsStrategy = VideoEffectsStrategy.BASIC
     debug: bool = False
+    durable_writes: bool = False
     audio_stream_index: int | None = None
     # YouTube upload settings
     youtube_upload: bool = False
@@ -29,6 +39,22 @@ class AppSettings(BaseSettings):
     youtube_client_secret: str | None = None
     youtube_project_id: str | None = None
     ffmpeg_path: Path | None = None
+    hwaccel: str | None = None
+    video_encoder: Literal["auto", "libx264", "h264_nvenc", "h264_qsv"] = "libx264"
+    video_preset: Literal[
+        "ultrafast",
+        "superfast",
+        "veryfast",
+        "faster",
+        "fast",
+        "medium",
+        "slow",
+        "slower",
+        "veryslow",
+    ] = "ultrafast"
+    video_crf: int = 23
+    video_fill_mode: Literal["pad", "crop", "blur"] = "pad"
+    max_workers: int | None = None
 
     class Config:
         env_file = ".env"
@@ -106,6 +132,22 @@ def parse_args() -> AppSettings:
         choices=["tiny", "base", "small", "medium", "large"],
         help="Size of the Whisper model for transcription (smaller models use less memory)",
     )
+    parser.add_argument(
+        "--whisper-language",
+        type=str,
+        default=None,
+        help="Language code of the speech (e.g. ru, en). English uses the faster English-only model",
+    )
+    parser.add_argument(
+        "--whisper-batch-size",
+        type=int,
+        default=None,
+        help=(
+            "Number of audio chunks transcribed in parallel (default 1 disables "
+            "batched inference). Batching is several times faster but returns "
+            "longer segments, so shorts can only start and end on coarser boundaries"
+        ),
+    )
     parser.add_argument(
         "--model-name",
         type=str,
@@ -118,6 +160,55 @@ def parse_args() -> AppSettings:
         default=None,
         help="Explicit path to the ffmpeg executable. Overrides PATH lookup.",
     )
+    parser.add_argument(
+        "--hwaccel",
+        type=str,
+        default=None,
+        help="ffmpeg hardware decoding method for the source video (e.g. auto, cuda, videotoolbox, qsv)",
+    )
+    parser.add_argument(
+        "--video-encoder",
+        type=str,
+        default=None,
+        choices=["auto", "libx264", "h264_nvenc", "h264_qsv"],
+        help="H.264 encoder for the effects passes (auto picks NVENC or Quick Sync when usable, else libx264)",
+    )
+    parser.add_argument(
+        "--video-preset",
+        type=str,
+        default=None,
+        choices=[
+            "ultrafast",
+            "superfast",
+            "veryfast",
+            "faster",
+            "fast",
+            "medium",
+            "slow",
+            "slower",
+            "veryslow",
+        ],
+        help="libx264 preset for the final encode (slower presets give smaller files)",
+    )
+    parser.add_argument(
+        "--video-crf",
+        type=int,
+        default=None,
+        help="libx264 constant rate factor for the final encode (lower is higher quality)",
+    )
+    parser.add_argument(
+        "--fill-mode",
+        type=str,
+        default=None,
+        choices=["pad", "crop", "blur"],
+        help="How wide video fills the vertical frame: black bars (pad), cropped sides (crop) or a blurred background (blur)",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="Number of shorts processed in parallel (defaults to half the CPU cores)",
+    )
     parser.add_argument(
         "--audio-stream-index",
         type=int,
@@ -164,10 +255,26 @@ def parse_args() -> AppSettings:
         settings_kwargs["youtube_privacy"] = args.youtube_privacy
     if args.ffmpeg_path is not None:
         settings_kwargs["ffmpeg_path"] = args.ffmpeg_path
+    if args.hwaccel is not None:
+        settings_kwargs["hwaccel"] = args.hwaccel
+    if args.video_encoder is not None:
+        settings_kwargs["video_encoder"] = args.video_encoder
+    if args.video_preset is not None:
+        settings_kwargs["video_preset"] = args.video_preset
+    if args.video_crf is not None:
+        settings_kwargs["video_crf"] = args.video_crf
+    if args.fill_mode is not None:
+        settings_kwargs["video_fill_mode"] = args.fill_mode
+    if args.max_workers is not None:
+        settings_kwargs["max_workers"] = args.max_workers
     if args.audio_stream_index is not None:
         settings_kwargs["audio_stream_index"] = args.audio_stream_index
     if args.whisper_model is not None:
         settings_kwargs["whisper_model_size"] = args.whisper_model
+    if args.whisper_language is not None:
+        settings_kwargs["whisper_language"] = args.whisper_language
+    if args.whisper_batch_size is not None:
+        settings_kwargs["whisper_batch_size"] = args.whisper_batch_size
     if args.model_name:
         settings_kwargs["model_name"] = args.model_name
 
@@ -1,6 +1,6 @@
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Literal, Optional, Sequence
 from shorts_creator.video_effect.video_effect import (
     VideoEffect,
     IncreaseVideoSpeedEffect,
@@ -23,21 +23,31 @@ class VideoEffectsStrategy(Enum):
         data_dir: Path,
         short_index: int,
         debug: bool = False,
+        fill_mode: Literal["pad", "crop", "blur"] = "pad",
+        clip_start: float | None = None,
     ) -> Sequence[VideoEffect]:
         match self:
             case VideoEffectsStrategy.BASIC:
-                return [
+                effects: list[VideoEffect] = [
                     AudioNormalizationEffect(target_lufs=-14.0, peak_limit=-1.0),
-                    VideoRatioConversionEffect(target_w=1080, target_h=1920),
+                    VideoRatioConversionEffect(
+                        target_w=1080, target_h=1920, fill_mode=fill_mode
+                    ),
                     TextEffect(text=short.title, text_align="top"),
                     CaptionsEffect(
                         youtube_short=short,
                         output_dir=data_dir,
                         short_index=short_index,
                         debug=debug,
+                        clip_start=clip_start,
                     ),
                     BlurFilterStartVideoEffect(blur_strength=20, duration=1.0),
-                    IncreaseVideoSpeedEffect(speed_factor=speed_factor, fps=30),
                 ]
+                # A 1.0x speed change is a no-op; skip its extra encode pass
+                if abs(speed_factor - 1.0) > 1e-6:
+                    effects.append(
+                        IncreaseVideoSpeedEffect(speed_factor=speed_factor, fps=30)
+                    )
+                return effects
             case _:
                 raise ValueError(f"Unknown strategy: {self}")
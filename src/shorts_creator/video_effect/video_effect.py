@@ -23,33 +23,89 @@ class IncreaseVideoSpeedEffect(VideoEffect):
     def apply(self, video_stream: Stream) -> list[Stream]:
         v = video_stream.video
         a = video_stream.audio
-        v = v.filter("setpts", f"PTS/{self.speed_factor}")
+        v = v.filter("setpts", f"PTS/{self.speed_factor}").filter(
+            "fps", fps=self.fps, round="near"
+        )
         a = a.filter("atempo", self.speed_factor)
-        v = v.filter("fps", fps=self.fps)
-        v = v.filter("format", "yuv420p")
-        return [a, v]
+        return [v, a]
 
 
 class VideoRatioConversionEffect(VideoEffect):
-    def __init__(self, target_w: int, target_h: int):
+    """Fit the video into the target frame.
+
+    "pad" letterboxes with black bars, "crop" fills the frame by cutting the
+    sides off and "blur" puts the letterboxed video over a blurred, cropped
+    copy of itself.
+    """
+
+    def __init__(
+        self,
+        target_w: int,
+        target_h: int,
+        fill_mode: Literal["pad", "crop", "blur"] = "pad",
+        blur_factor: int = 16,
+    ):
         self.target_w = target_w
         self.target_h = target_h
+        self.fill_mode = fill_mode
+        self.blur_factor = blur_factor
+
+    def _fit(self, v: Stream, target_ratio: float) -> Stream:
+        return v.filter(
+            "scale",
+            f"if(gt(iw/ih,{target_ratio}),{self.target_w},-1)",
+            f"if(gt(iw/ih,{target_ratio}),-1,{self.target_h})",
+        )
+
+    def _fill(self, v: Stream, target_ratio: float) -> Stream:
+        return v.filter(
+            "scale",
+            f"if(gt(iw/ih,{target_ratio}),-2,{self.target_w})",
+            f"if(gt(iw/ih,{target_ratio}),{self.target_h},-2)",
+        ).filter("crop", self.target_w, self.target_h)
 
     def apply(self, video_stream: Stream) -> list[Stream]:
+        import ffmpeg
+
         v = video_stream.video
         a = video_stream.audio
 
         # Calculate target aspect ratio for comparison in filter expressions
         target_ratio = self.target_w / self.target_h
 
-        v = v.filter(
-            "scale",
-            f"if(gt(iw/ih,{target_ratio}),{self.target_w},-1)",
-            f"if(gt(iw/ih,{target_ratio}),-1,{self.target_h})",
-        )
-        v = v.filter(
-            "pad", self.target_w, self.target_h, "(ow-iw)/2", "(oh-ih)/2", "black"
-        )
+        match self.fill_mode:
+            case "pad":
+                v = self._fit(v, target_ratio).filter(
+                    "pad",
+                    self.target_w,
+                    self.target_h,
+                    "(ow-iw)/2",
+                    "(oh-ih)/2",
+                    "black",
+                )
+            case "crop":
+                v = self._fill(v, target_ratio)
+            case "blur":
+                split = v.split()
+                background, foreground = split[0], split[1]
+                # Shrinking and scaling back up bilinearly blurs cheaply
+                background = (
+                    self._fill(background, target_ratio)
+                    .filter(
+                        "scale",
+                        f"trunc(iw/{self.blur_factor}/2)*2",
+                        f"trunc(ih/{self.blur_factor}/2)*2",
+                    )
+                    .filter("scale", self.target_w, self.target_h, flags="bilinear")
+                )
+                v = ffmpeg.overlay(
+                    background,
+                    self._fit(foreground, target_ratio),
+                    x="(W-w)/2",
+                    y="(H-h)/2",
+                )
+            case _:
+                raise ValueError(f"Unknown fill mode: {self.fill_mode}")
 
         return [v, a]
 
@@ -105,21 +161,7 @@ class TextEffect(VideoEffect):
         y_position = self._calculate_y_position()
         render_text = self._wrap_text(self.text)
 
-        # Add text with shadow effect (similar to original implementation)
-        # First add black shadow
-        v = v.filter(
-            "drawtext",
-            text=render_text,
-            fontfile=self.font_path,
-            fontsize=self.font_size,
-            fontcolor="black",
-            x="(w-text_w)/2+2",
-            y=f"{y_position}+2",
-            alpha="0.8",
-            line_spacing=10,
-        )
-
-        # Then add main text with border
+        # Bordered text with a drop shadow, drawn by a single drawtext filter
         v = v.filter(
             "drawtext",
             text=render_text,
@@ -130,7 +172,12 @@ class TextEffect(VideoEffect):
             y=str(y_position),
             borderw=3,
             bordercolor="black",
+            shadowx=2,
+            shadowy=2,
+            shadowcolor="black@0.8",
             line_spacing=10,
+            # The title is literal text; skip %{...} expansion on every frame
+            expansion="none",
         )
 
         return [v, a]
@@ -152,10 +199,12 @@ class PixelateFilterStartVideoEffect(VideoEffect):
 
         # Simple approach: apply pixelation to the entire video, then trim segments
         # This avoids dimension mismatch issues by keeping all operations on the same base
+        # An upstream filter output can feed only one branch, so split it first
+        split = v.split()
 
         # Get the first segment (pixelated start)
         v_pixelated = (
-            v.filter(
+            split[0].filter(
                 "scale", f"iw/{self.pixelation_level}", f"ih/{self.pixelation_level}"
             )
             .filter(
@@ -169,7 +218,7 @@ class PixelateFilterStartVideoEffect(VideoEffect):
         )
 
         # Get the remaining part (normal quality)
-        v_normal = v.filter("trim", start=self.duration).filter(
+        v_normal = split[1].filter("trim", start=self.duration).filter(
             "setpts", "PTS-STARTPTS"
         )
 
@@ -180,10 +229,19 @@ class PixelateFilterStartVideoEffect(VideoEffect):
 
 
 class BlurFilterStartVideoEffect(VideoEffect):
-    def __init__(self, blur_strength: int = 20, duration: float = 1.0, steps: int = 10):
+    def __init__(
+        self,
+        blur_strength: int = 20,
+        duration: float = 1.0,
+        steps: int = 10,
+        target_w: int = 1080,
+        target_h: int = 1920,
+    ):
         self.blur_strength = blur_strength
         self.duration = duration
         self.steps = steps  # Number of blur steps for gradual decrease
+        self.target_w = target_w
+        self.target_h = target_h
 
     def apply(self, video_stream: Stream) -> list[Stream]:
         import ffmpeg
@@ -194,6 +252,9 @@ class BlurFilterStartVideoEffect(VideoEffect):
         # Create gradual blur decrease by creating multiple segments with different blur levels
         step_duration = self.duration / self.steps
         segments = []
+        # An upstream filter output can feed only one branch, so give each
+        # segment its own copy of the stream
+        split = v.split()
 
         for i in range(self.steps):
             start_time = i * step_duration
@@ -202,25 +263,36 @@ class BlurFilterStartVideoEffect(VideoEffect):
             # Calculate blur strength for this step (decreases linearly)
             blur_for_step = self.blur_strength * (1 - i / self.steps)
 
-            # Apply blur first, then trim to avoid frame timing issues
-            if blur_for_step > 0:
-                # Apply blur to the entire video, then trim the segment
+            # Shrinking by the blur strength and scaling back up bilinearly looks
+            # like a heavy blur but is far cheaper than boxblur
+            factor = round(blur_for_step)
+            if factor > 1:
                 segment = (
-                    v.filter("boxblur", blur_for_step)
+                    split[i]
                     .filter("trim", start=start_time, end=end_time)
                     .filter("setpts", "PTS-STARTPTS")
+                    .filter(
+                        "scale",
+                        f"trunc(iw/{factor}/2)*2",
+                        f"trunc(ih/{factor}/2)*2",
+                    )
+                    .filter("scale", self.target_w, self.target_h, flags="bilinear")
                 )
             else:
                 # No blur for this segment, just trim
-                segment = v.filter("trim", start=start_time, end=end_time).filter(
-                    "setpts", "PTS-STARTPTS"
+                segment = (
+                    split[i]
+                    .filter("trim", start=start_time, end=end_time)
+                    .filter("setpts", "PTS-STARTPTS")
                 )
 
             segments.append(segment)
 
         # Add the remaining part of the video (after blur duration) without blur
-        remaining_part = v.filter("trim", start=self.duration).filter(
-            "setpts", "PTS-STARTPTS"
+        remaining_part = (
+            split[self.steps]
+            .filter("trim", start=self.duration)
+            .filter("setpts", "PTS-STARTPTS")
         )
         segments.append(remaining_part)
 
@@ -295,8 +367,11 @@ class CaptionsEffect(VideoEffect):
         dim_color: tuple[int, int, int] = (255, 255, 255),
         max_words_per_line=10,
         debug: bool = False,
+        clip_start: float | None = None,
     ):
         self.youtube_short = youtube_short
+        # Source time of the clip's first frame; captions are timed from it
+        self.clip_start = youtube_short.start_time if clip_start is None else clip_start
         self.font_size = font_size
         self.font_color = font_color
         self.outline_color = outline_color
@@ -308,6 +383,11 @@ class CaptionsEffect(VideoEffect):
         self.target_h = target_h
         self.highlight_color = highlight_color
         self.dim_color = dim_color
+        # ASS colours are BGR hex; format them once instead of for every word
+        self._highlight_hex = (
+            f"{highlight_color[2]:02X}{highlight_color[1]:02X}{highlight_color[0]:02X}"
+        )
+        self._dim_hex = f"{dim_color[2]:02X}{dim_color[1]:02X}{dim_color[0]:02X}"
         self.font_name = font_name
         self.output_path = output_dir / f"short_{short_index}_captions.ass"
         self.max_words_per_line = max_words_per_line
@@ -317,8 +397,8 @@ class CaptionsEffect(VideoEffect):
         if highlight_idx >= len(words):
             return " ".join(words)
 
-        yellow = f"{self.highlight_color[2]:02X}{self.highlight_color[1]:02X}{self.highlight_color[0]:02X}"
-        white = f"{self.dim_color[2]:02X}{self.dim_color[1]:02X}{self.dim_color[0]:02X}"
+        yellow = self._highlight_hex
+        white = self._dim_hex
 
         result_words = []
         for i, word in enumerate(words):
@@ -330,9 +410,8 @@ class CaptionsEffect(VideoEffect):
         return f"{{\\c&H{white}&}}" + " ".join(result_words)
 
     def _calculate_word_timings(
-        self, text: str, start_time: float, end_time: float
+        self, words: List[str], start_time: float, end_time: float
     ) -> List[tuple[str, float, float]]:
-        words = text.split()
         if not words:
             return []
 
@@ -379,17 +458,11 @@ class CaptionsEffect(VideoEffect):
             if not segment.text.strip():
                 continue
 
-            start_time = max(0.0, segment.start_time - self.youtube_short.start_time)
-            end_time = max(
-                start_time + 0.1, segment.end_time - self.youtube_short.start_time
-            )
-
-            processed_text = segment.text.strip().capitalize()
+            start_time = max(0.0, segment.start_time - self.clip_start)
+            end_time = max(start_time + 0.1, segment.end_time - self.clip_start)
 
-            word_timings = self._calculate_word_timings(
-                processed_text, start_time, end_time
-            )
-            words = processed_text.split()
+            words = segment.text.strip().capitalize().split()
+            word_timings = self._calculate_word_timings(words, start_time, end_time)
 
             lines = [
                 words[i : i + self.max_words_per_line]
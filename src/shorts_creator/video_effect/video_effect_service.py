@@ -1,6 +1,7 @@
+from functools import lru_cache
 from pathlib import Path
-from shorts_creator.pipeline.video_cutter import create_short_video
-from shorts_creator.pipeline.audio_retriever import _resolve_ffmpeg_binary
+from typing import NamedTuple, Sequence
+from shorts_creator.pipeline.audio_retriever import resolve_ffmpeg_binary
 from shorts_creator.video_effect.video_effect import VideoEffect
 from shorts_creator.video_effect.strategies import VideoEffectsStrategy
 from shorts_creator.settings.settings import AppSettings
@@ -10,6 +11,27 @@ import ffmpeg
 
 log = getLogger(__name__)
 
+# Hardware encoders tried, in order, when the video encoder is "auto"
+_HARDWARE_ENCODERS = ("h264_nvenc", "h264_qsv")
+
+
+class _EffectStreams(NamedTuple):
+    """Video and audio streams handed from one effect to the next."""
+
+    video: ffmpeg.nodes.Stream
+    audio: ffmpeg.nodes.Stream
+
+
+def _chain_effects(
+    input_stream: ffmpeg.nodes.Stream, effects: Sequence[VideoEffect]
+) -> _EffectStreams:
+    """Chain every effect into one filter graph fed by input_stream."""
+    streams = _EffectStreams(input_stream.video, input_stream.audio)
+    for effect in effects:
+        log.debug(f"Adding effect: {effect.__class__.__name__}")
+        streams = _EffectStreams(*effect.apply(streams))
+    return streams
+
 
 def _create_file_name(
     video_name: str, video_ext: str, effect: VideoEffect, index: int
@@ -17,45 +39,103 @@ def _create_file_name(
     return f"{video_name}_{effect.__class__.__name__}_{index}.{video_ext}"
 
 
+@lru_cache(maxsize=4)
+def resolve_video_encoder(video_encoder: str, resolved_ffmpeg: str) -> str:
+    if video_encoder != "auto":
+        return video_encoder
+
+    for encoder in _HARDWARE_ENCODERS:
+        # ffmpeg lists encoders it was built with even when no matching device
+        # is present, so confirm with a tiny test encode
+        try:
+            ffmpeg.input("color=size=256x256:duration=0.1", f="lavfi").output(
+                "-", vcodec=encoder, f="null"
+            ).run(quiet=True, cmd=resolved_ffmpeg)
+        except (ffmpeg.Error, OSError):
+            continue
+        log.info(f"Using hardware video encoder: {encoder}")
+        return encoder
+
+    log.info("No hardware video encoder available, using libx264")
+    return "libx264"
+
+
+def _encoder_kwargs(
+    video_encoder: str, preset: str = "ultrafast", crf: int = 23
+) -> dict[str, object]:
+    match video_encoder:
+        case "h264_nvenc":
+            return {
+                "vcodec": "h264_nvenc",
+                "preset": "p4",
+                "tune": "hq",
+                "rc": "vbr",
+                "cq": 23,
+                "video_bitrate": "5M",
+            }
+        case "h264_qsv":
+            return {
+                "vcodec": "h264_qsv",
+                "preset": "veryfast",
+                "global_quality": 23,
+                "video_bitrate": "5M",
+            }
+        case "libx264":
+            # Constant quality instead of a bitrate target: YouTube re-encodes
+            # the upload anyway, so a fast preset costs little visible quality
+            return {
+                "vcodec": "libx264",
+                "preset": preset,
+                "crf": crf,
+                "x264-params": "scenecut=0:open_gop=0:ref=1",
+            }
+        case _:
+            raise ValueError(f"Unknown video encoder: {video_encoder}")
+
+
 def _write_output_video(
     video_streams: list[ffmpeg.nodes.Stream],
     output_file: Path,
     debug: bool,
     ffmpeg_path: Path | None,
+    video_encoder: str = "libx264",
+    threads: int | None = None,
+    preset: str = "ultrafast",
+    crf: int = 23,
 ):
     out_kwargs = {
-        "vcodec": "libx264",
+        **_encoder_kwargs(video_encoder, preset, crf),
         "acodec": "aac",
-        "video_bitrate": "5M",
         "audio_bitrate": "192k",
         "ar": 48000,
         "pix_fmt": "yuv420p",
-        "preset": "fast",
         "force_key_frames": "0:00:00.000",
         "bf": 0,
         "g": 30 * 2,
         "movflags": "+faststart",
         "muxpreload": 0,
         "muxdelay": 0,
-        "x264-params": "scenecut=0:open_gop=0:ref=1",
+        "threads": threads or 0,
     }
-    resolved_ffmpeg = _resolve_ffmpeg_binary(ffmpeg_path)
-
-    ffmpeg.output(*video_streams, str(output_file), **out_kwargs).run(
+    resolved_ffmpeg = resolve_ffmpeg_binary(ffmpeg_path)
+
+    output = ffmpeg.output(*video_streams, str(output_file), **out_kwargs)
+    if threads:
+        # The effect filters run on ffmpeg's filter threads, which otherwise
+        # default to every core regardless of the encoder's share
+        output = output.global_args(
+            "-filter_threads",
+            str(threads),
+            "-filter_complex_threads",
+            str(threads),
+        )
+    output.run(
         overwrite_output=True,
         quiet=not debug,
         cmd=resolved_ffmpeg,
     )
 
 
-def _delete_old_files(old_video_files: list[Path]):
-    for file in old_video_files:
-        try:
-            file.unlink()
-        except Exception as e:
-            log.warning(f"Failed to delete old video file {file}: {e}")
-
-
 def apply_effects(
     short: YouTubeShortWithSpeech,
     settings: AppSettings,
@@ -63,6 +143,8 @@ def apply_effects(
     strategy: VideoEffectsStrategy,
     output_dir: Path,
     short_index: int = 0,
+    threads: int | None = None,
+    clip_start: float | None = None,
 ) -> Path:
     video_name, video_ext = video_path.name.split(".")
 
@@ -74,16 +156,38 @@ def apply_effects(
         data_dir=settings.data_dir,
         short_index=short_index,
         debug=settings.debug,
+        fill_mode=settings.video_fill_mode,
+        clip_start=clip_start,
     )
 
-    output_file = None
-    old_video_files = []
+    input_kwargs = {"fflags": "+genpts"}
+    if settings.hwaccel:
+        input_kwargs["hwaccel"] = settings.hwaccel
+
+    if not settings.debug:
+        # Chain every effect into one filter graph: a single decode and encode
+        # instead of one full transcode per effect
+        input_stream = ffmpeg.input(str(video_path), **input_kwargs)
+        streams = _chain_effects(input_stream, effects)
+
+        output_file = output_dir / f"{video_name}_effects.{video_ext}"
+        _write_output_video(
+            list(streams),
+            output_file,
+            settings.debug,
+            settings.ffmpeg_path,
+            settings.video_encoder,
+            threads,
+            settings.video_preset,
+            settings.video_crf,
+        )
+        return output_file
 
+    # In debug mode every effect gets its own pass so intermediate files can be
+    # inspected
     for i, effect in enumerate(effects):
-        if output_file is not None:
-            old_video_files.append(output_file)
         log.debug(f"Applying effect: {effect.__class__.__name__} to {curr_video_path}")
-        video_stream = ffmpeg.input(str(curr_video_path), fflags="+genpts")
+        video_stream = ffmpeg.input(str(curr_video_path), **input_kwargs)
         output_file = output_dir / _create_file_name(video_name, video_ext, effect, i)
         video_stream = effect.apply(video_stream)
         _write_output_video(
@@ -91,10 +195,11 @@ def apply_effects(
             output_file,
             settings.debug,
             settings.ffmpeg_path,
+            settings.video_encoder,
+            threads,
+            settings.video_preset,
+            settings.video_crf,
         )
         curr_video_path = output_file
 
-    if not settings.debug:
-        _delete_old_files(old_video_files)
-
     return curr_video_path
@@ -0,0 +1,38 @@
+from pathlib import Path
+
+import pytest
+
+from shorts_creator.domain.models import SpeechSegment, YouTubeShortWithSpeech
+from shorts_creator.settings.settings import AppSettings
+
+
+@pytest.fixture
+def make_short():
+    def _make_short(
+        start_time: float = 10.0,
+        end_time: float = 15.0,
+        speech: list[SpeechSegment] | None = None,
+    ) -> YouTubeShortWithSpeech:
+        return YouTubeShortWithSpeech(
+            title="A short title",
+            subscribe_subtitle="Subscribe for more",
+            start_segment_index=0,
+            end_segment_index=1,
+            description="x" * 500,
+            estimated_duration="30-60 seconds",
+            tags=[f"tag{i}" for i in range(20)],
+            speech=speech or [],
+            start_time=start_time,
+            end_time=end_time,
+        )
+
+    return _make_short
+
+
+@pytest.fixture
+def settings(tmp_path: Path) -> AppSettings:
+    return AppSettings(
+        openai_api_key="test-key",
+        video_path=tmp_path / "source.mp4",
+        data_dir=tmp_path,
+    )
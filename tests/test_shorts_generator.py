@@ -0,0 +1,190 @@
+import httpx
+import pytest
+
+from shorts_creator.domain.models import Speech, SpeechSegment, YouTubeShort
+from shorts_creator.pipeline import shorts_generator
+from shorts_creator.pipeline.shorts_generator import (
+    YouTubeShortsRecommendationResponse,
+)
+
+
+def _speech(*bounds: tuple[float, float]) -> Speech:
+    return Speech(
+        language="en",
+        duration_seconds=bounds[-1][1],
+        segments=[
+            SpeechSegment(start_time=start, end_time=end, text=f"line {i}")
+            for i, (start, end) in enumerate(bounds)
+        ],
+    )
+
+
+def _response(start: int, end: int) -> YouTubeShortsRecommendationResponse:
+    return YouTubeShortsRecommendationResponse(
+        shorts=[
+            YouTubeShort(
+                title="A short title",
+                subscribe_subtitle="Subscribe for more",
+                start_segment_index=start,
+                end_segment_index=end,
+                description="x" * 500,
+                estimated_duration="30-60 seconds",
+                tags=[f"tag{i}" for i in range(20)],
+            )
+        ],
+        total_shorts_found=1,
+        analysis_summary="summary",
+    )
+
+
+def test_group_segments_merges_until_min_line_length():
+    speech = _speech((0, 1), (1, 2), (2, 5), (5, 5.5), (5.5, 6))
+
+    assert shorts_generator._group_segments(speech) == [(0, 1), (2, 2), (3, 4)]
+
+
+def test_add_timestamps_maps_lines_back_to_segments():
+    speech = _speech((0, 1), (1, 2), (2, 5), (5, 6), (6, 8))
+    groups = [(0, 1), (2, 2), (3, 4)]
+
+    result = shorts_generator._add_timestamps_to_shorts(
+        _response(1, 2), speech, groups
+    )
+
+    (short,) = result.shorts
+    assert (short.start_segment_index, short.end_segment_index) == (2, 4)
+    assert (short.start_time, short.end_time) == (2, 8)
+    assert [s.text for s in short.speech] == ["line 2", "line 3", "line 4"]
+
+
+@pytest.mark.parametrize(("start", "end"), [(-1, 0), (0, 3), (2, 1)])
+def test_add_timestamps_skips_invalid_line_ranges(start, end):
+    speech = _speech((0, 1), (1, 2), (2, 5))
+    groups = [(0, 1), (2, 2)]
+
+    result = shorts_generator._add_timestamps_to_shorts(
+        _response(start, end), speech, groups
+    )
+
+    assert result.shorts == []
+
+
+def test_format_segments_rejects_cap_below_first_line():
+    speech = _speech((0, 2), (2, 4))
+
+    with pytest.raises(ValueError, match="llm_max_transcript_chars"):
+        shorts_generator._format_segments_for_analysis(
+            speech, shorts_generator._group_segments(speech), 5
+        )
+
+
+class TestPromptCache:
+    @pytest.fixture
+    def api_calls(self, monkeypatch):
+        calls = []
+
+        def _call(system_prompt, user_prompt, settings):
+            calls.append(settings.model_name)
+            return _response(0, 1)
+
+        monkeypatch.setattr(shorts_generator, "_call_openai_api", _call)
+        return calls
+
+    def _generate(self, settings, tmp_path):
+        speech = _speech((0, 2), (2, 4), (4, 6))
+        return shorts_generator.generate_youtube_shorts_recommendations(
+            speech, settings, tmp_path / "shorts.json"
+        )
+
+    def test_reuses_cached_response(self, settings, tmp_path, api_calls):
+        settings.refresh = False
+
+        first = self._generate(settings, tmp_path)
+        second = self._generate(settings, tmp_path)
+
+        assert len(api_calls) == 1
+        assert second == first
+
+    def test_changed_prompt_inputs_miss_the_cache(self, settings, tmp_path, api_calls):
+        settings.refresh = False
+        self._generate(settings, tmp_path)
+
+        settings.model_name = "another/model"
+        self._generate(settings, tmp_path)
+
+        assert api_calls == ["openai/gpt-5-mini", "another/model"]
+
+    def test_refresh_bypasses_the_cache(self, settings, tmp_path, api_calls):
+        settings.refresh = True
+
+        self._generate(settings, tmp_path)
+        self._generate(settings, tmp_path)
+
+        assert len(api_calls) == 2
+
+
+class TestPostWithRetries:
+    @pytest.fixture
+    def sleeps(self, monkeypatch):
+        delays = []
+        monkeypatch.setattr(shorts_generator.time, "sleep", delays.append)
+        return delays
+
+    def _post(self, monkeypatch, settings, handler):
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(shorts_generator, "_get_http_client", lambda: client)
+        return shorts_generator._post_with_retries(
+            "https://api.test/chat/completions", {}, {}, settings
+        )
+
+    def test_retries_transient_statuses(self, monkeypatch, settings, sleeps):
+        settings.openai_timeout_seconds = 7
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(503 if len(requests) < 3 else 200)
+
+        response = self._post(monkeypatch, settings, handler)
+
+        assert response.status_code == 200
+        assert len(requests) == 3
+        assert len(sleeps) == 2
+        assert requests[0].extensions["timeout"]["read"] == 7
+
+    def test_honours_retry_after(self, monkeypatch, settings, sleeps):
+        responses = iter(
+            [httpx.Response(429, headers={"retry-after": "2"}), httpx.Response(200)]
+        )
+
+        self._post(monkeypatch, settings, lambda request: next(responses))
+
+        assert sleeps == [2.0]
+
+    def test_returns_last_response_when_retries_run_out(
+        self, monkeypatch, settings, sleeps
+    ):
+        settings.openai_max_retries = 2
+
+        response = self._post(monkeypatch, settings, lambda r: httpx.Response(500))
+
+        assert response.status_code == 500
+        assert len(sleeps) == 2
+
+    def test_does_not_retry_client_errors(self, monkeypatch, settings, sleeps):
+        response = self._post(monkeypatch, settings, lambda r: httpx.Response(401))
+
+        assert response.status_code == 401
+        assert sleeps == []
+
+    def test_raises_after_repeated_connection_errors(
+        self, monkeypatch, settings, sleeps
+    ):
+        settings.openai_max_retries = 1
+
+        def handler(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        with pytest.raises(RuntimeError, match="Failed to contact"):
+            self._post(monkeypatch, settings, handler)
+        assert len(sleeps) == 1
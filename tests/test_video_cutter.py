@@ -0,0 +1,224 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from shorts_creator.pipeline import storage, video_cutter
+
+
+def _touch(path: Path, mtime: float) -> Path:
+    path.write_bytes(b"")
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.mark.parametrize(
+    ("time", "expected"),
+    [(-1.0, None), (0.0, 0.0), (1.9, 0.0), (2.0, 2.0), (9.0, 4.0)],
+)
+def test_keyframe_at_or_before(time, expected):
+    assert video_cutter._keyframe_at_or_before((0.0, 2.0, 4.0), time) == expected
+
+
+def test_keyframe_times_are_relative_to_container_start(monkeypatch):
+    probe = {
+        "format": {"start_time": "1.400000"},
+        "packets": [
+            {"pts_time": "3.4", "flags": "K__"},
+            {"pts_time": "1.4", "flags": "K__"},
+            {"pts_time": "2.4", "flags": "___"},
+        ],
+    }
+    monkeypatch.setattr(video_cutter.ffmpeg, "probe", lambda *args, **kwargs: probe)
+    video_cutter._keyframe_times.cache_clear()
+
+    keyframes = video_cutter._keyframe_times(Path("source.ts"), "ffmpeg")
+
+    assert keyframes == pytest.approx((0.0, 2.0))
+
+
+class TestSkipIfCached:
+    @pytest.fixture
+    def source(self, tmp_path):
+        return _touch(tmp_path / "source.mp4", 1000)
+
+    @pytest.fixture
+    def output(self, tmp_path):
+        return _touch(tmp_path / "short_1_0s-60s.mp4", 2000)
+
+    def test_reuses_output_with_matching_key(self, source, output):
+        video_cutter.save_cache_key(output, {"start": 1.5})
+
+        assert video_cutter.skip_if_cached(output, False, source, {"start": 1.5})
+
+    def test_ignores_extra_sidecar_fields(self, source, output):
+        video_cutter.save_cache_key(output, {"start": 1.5, "cut_start": 1.0})
+
+        assert video_cutter.skip_if_cached(output, False, source, {"start": 1.5})
+
+    def test_regenerates_on_refresh(self, source, output):
+        video_cutter.save_cache_key(output, {"start": 1.5})
+
+        assert not video_cutter.skip_if_cached(output, True, source, {"start": 1.5})
+
+    def test_regenerates_missing_output(self, source, tmp_path):
+        missing = tmp_path / "missing.mp4"
+
+        assert not video_cutter.skip_if_cached(missing, False, source)
+
+    def test_regenerates_output_older_than_source(self, source, output):
+        os.utime(output, (500, 500))
+
+        assert not video_cutter.skip_if_cached(output, False, source)
+
+    def test_regenerates_on_changed_key(self, source, output):
+        video_cutter.save_cache_key(output, {"start": 1.5})
+
+        assert not video_cutter.skip_if_cached(output, False, source, {"start": 2.0})
+
+    def test_regenerates_without_sidecar(self, source, output):
+        assert not video_cutter.skip_if_cached(output, False, source, {"start": 1.5})
+
+
+def test_read_cut_start(tmp_path):
+    cut = tmp_path / "short_1_0s-60s_cut.mp4"
+    assert video_cutter.read_cut_start(cut, 5.0) == 5.0
+
+    video_cutter.save_cache_key(cut, {"cut_start": 4.9})
+
+    assert video_cutter.read_cut_start(cut, 5.0) == 4.9
+
+
+def test_remove_cached_deletes_output_and_sidecar(tmp_path):
+    output = _touch(tmp_path / "short.mp4", 1000)
+    video_cutter.save_cache_key(output, {"start": 1.5})
+
+    video_cutter.remove_cached(output)
+
+    assert not output.exists()
+    assert not output.with_suffix(".json").exists()
+
+
+class TestCreateShortVideosBatch:
+    @pytest.fixture
+    def cut_groups(self, monkeypatch):
+        groups = []
+        monkeypatch.setattr(video_cutter, "resolve_ffmpeg_binary", lambda _: "ffmpeg")
+        monkeypatch.setattr(video_cutter, "_keyframe_times", lambda *args: ())
+        monkeypatch.setattr(
+            video_cutter,
+            "_cut_group",
+            lambda input_video, group, *args: groups.append(group),
+        )
+        return groups
+
+    def test_groups_pending_shorts_by_start_time(
+        self, tmp_path, make_short, cut_groups
+    ):
+        source = _touch(tmp_path / "source.mp4", 1000)
+        shorts = [make_short(s, s + 30) for s in (300, 0, 200, 100)]
+
+        paths = video_cutter.create_short_videos_batch(
+            source, shorts, tmp_path, False, False, None, max_workers=2
+        )
+
+        assert [p.name for p in paths] == [
+            "short_1_300s-330s_cut.mp4",
+            "short_2_0s-30s_cut.mp4",
+            "short_3_200s-230s_cut.mp4",
+            "short_4_100s-130s_cut.mp4",
+        ]
+        assert [[short.start_time for short, _ in g] for g in cut_groups] == [
+            [0, 100],
+            [200, 300],
+        ]
+
+    def test_names_files_by_short_indices(self, tmp_path, make_short, cut_groups):
+        source = _touch(tmp_path / "source.mp4", 1000)
+
+        paths = video_cutter.create_short_videos_batch(
+            source,
+            [make_short(0, 30)],
+            tmp_path,
+            False,
+            False,
+            None,
+            short_indices=[4],
+        )
+
+        assert paths[0].name == "short_5_0s-30s_cut.mp4"
+
+    def test_skips_cached_cuts(self, tmp_path, make_short, cut_groups):
+        source = _touch(tmp_path / "source.mp4", 1000)
+        cached, fresh = make_short(0, 30), make_short(100, 130)
+        cached_path = _touch(tmp_path / "short_1_0s-30s_cut.mp4", 2000)
+        video_cutter.save_cache_key(
+            cached_path, video_cutter._cut_cache_key(source, cached, None)
+        )
+
+        video_cutter.create_short_videos_batch(
+            source, [cached, fresh], tmp_path, False, False, None
+        )
+
+        assert [[short for short, _ in g] for g in cut_groups] == [[fresh]]
+
+
+class TestCutGroup:
+    @pytest.fixture
+    def merged_outputs(self, monkeypatch):
+        runs = []
+
+        class _Merged:
+            def __init__(self, *outputs):
+                runs.append(outputs)
+
+            def run(self, **kwargs):
+                pass
+
+        monkeypatch.setattr(video_cutter.ffmpeg, "merge_outputs", _Merged)
+        return runs
+
+    def _cut(self, tmp_path, short, keyframes):
+        path = tmp_path / "short_1_cut.mp4"
+        video_cutter._cut_group(
+            tmp_path / "source.mp4",
+            [(short, path)],
+            keyframes,
+            False,
+            "ffmpeg",
+            None,
+            None,
+        )
+        return storage.read_json(path.with_suffix(".json"))
+
+    def test_copies_from_nearby_keyframe(
+        self, tmp_path, make_short, merged_outputs, monkeypatch
+    ):
+        monkeypatch.setattr(video_cutter, "_copy_cut", lambda *args: True)
+
+        sidecar = self._cut(tmp_path, make_short(10.05, 40), (0.0, 10.0))
+
+        assert sidecar["cut_start"] == 10.0
+        assert merged_outputs == []
+
+    def test_reencodes_when_copy_fails(
+        self, tmp_path, make_short, merged_outputs, monkeypatch
+    ):
+        monkeypatch.setattr(video_cutter, "_copy_cut", lambda *args: False)
+
+        sidecar = self._cut(tmp_path, make_short(10.05, 40), (0.0, 10.0))
+
+        assert sidecar["cut_start"] == 10.05
+        assert len(merged_outputs) == 1
+
+    def test_reencodes_far_from_keyframe(
+        self, tmp_path, make_short, merged_outputs, monkeypatch
+    ):
+        monkeypatch.setattr(
+            video_cutter, "_copy_cut", lambda *args: pytest.fail("copied the cut")
+        )
+
+        sidecar = self._cut(tmp_path, make_short(12.0, 40), (0.0, 10.0))
+
+        assert sidecar["cut_start"] == 12.0
+        assert len(merged_outputs) == 1
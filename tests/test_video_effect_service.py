@@ -0,0 +1,29 @@
+import ffmpeg
+import pytest
+
+from shorts_creator.domain.models import SpeechSegment
+from shorts_creator.video_effect.strategies import VideoEffectsStrategy
+from shorts_creator.video_effect.video_effect_service import _chain_effects
+
+
+@pytest.mark.parametrize("fill_mode", ["pad", "crop", "blur"])
+@pytest.mark.parametrize("speed_factor", [1.0, 1.35])
+def test_fused_basic_graph_compiles(tmp_path, make_short, fill_mode, speed_factor):
+    short = make_short(
+        speech=[
+            SpeechSegment(start_time=10.0, end_time=12.5, text="hello there"),
+            SpeechSegment(start_time=12.5, end_time=15.0, text="general kenobi"),
+        ]
+    )
+    effects = VideoEffectsStrategy.BASIC.create_effects(
+        short=short,
+        speed_factor=speed_factor,
+        data_dir=tmp_path,
+        short_index=0,
+        fill_mode=fill_mode,
+    )
+    streams = _chain_effects(ffmpeg.input(str(tmp_path / "cut.mp4")), effects)
+
+    args = ffmpeg.output(*streams, str(tmp_path / "out.mp4")).compile()
+
+    assert "-filter_complex" in args